@@ -6,23 +6,20 @@ This demonstrates how to add checkpointing for:
 3. Time-travel through conversation history
 """
 
-import os
-from datetime import datetime
-from dotenv import load_dotenv
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
 
-# Load environment variables from .env file
-load_dotenv()
-
-from langchain.chat_models import init_chat_model
 from deepagents import create_deep_agent
-from langgraph.checkpoint.memory import InMemorySaver, PersistentDict
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 
-from research_agent.prompts import (
-    RESEARCHER_INSTRUCTIONS,
-    RESEARCH_WORKFLOW_INSTRUCTIONS,
-    SUBAGENT_DELEGATION_INSTRUCTIONS,
-)
-from research_agent.tools import tavily_search, think_tool
+# Reuse the prompts, sub-agent and model configured for the server agent
+from research_agent.config import INSTRUCTIONS, context_compaction, model, research_sub_agent
+from research_agent.embeddings import cosine_similarity, embed
 
 # ============================================================================
 # CHECKPOINTER OPTIONS
@@ -39,126 +36,140 @@ def get_memory_checkpointer():
     return InMemorySaver()
 
 
-def get_persistent_checkpointer(db_path="./checkpoints.db"):
-    """Option 2: Persistent checkpointer (survives restarts)
+def get_sqlite_checkpointer(db_path="./research_checkpoints.db"):
+    """Option 2: SQLite checkpointer (survives restarts)
 
-    - Stores to disk using pickle
+    - Stores to a SQLite database file
     - Persists across restarts
+    - Writes one row per checkpoint instead of rewriting the whole store
     - Good for: Development, single-user apps
 
     Args:
-        db_path: Path to checkpoint file
+        db_path: Path to the SQLite database file
     """
-    # Create storage using PersistentDict
-    storage = PersistentDict(filename=db_path)
-    writes = PersistentDict(filename=db_path + ".writes")
-    blobs = PersistentDict(filename=db_path + ".blobs")
-
-    # Load existing data if file exists
-    if os.path.exists(db_path):
-        storage.load()
-    if os.path.exists(db_path + ".writes"):
-        writes.load()
-    if os.path.exists(db_path + ".blobs"):
-        blobs.load()
-
-    return InMemorySaver(
-        factory=lambda: storage if storage else PersistentDict(filename=db_path)
-    )
+    # check_same_thread=False: the agent may run tool calls on worker threads
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    return SqliteSaver(conn)
 
 
-# ============================================================================
-# AGENT CONFIGURATION
-# ============================================================================
-
-# Limits
-max_concurrent_research_units = 3
-max_researcher_iterations = 3
-
-# Get current date
-current_date = datetime.now().strftime("%Y-%m-%d")
-
-# Combine orchestrator instructions
-INSTRUCTIONS = (
-    RESEARCH_WORKFLOW_INSTRUCTIONS
-    + "\n\n"
-    + "=" * 80
-    + "\n\n"
-    + SUBAGENT_DELEGATION_INSTRUCTIONS.format(
-        max_concurrent_research_units=max_concurrent_research_units,
-        max_researcher_iterations=max_researcher_iterations,
-    )
-)
+def get_async_sqlite_checkpointer(db_path="./research_checkpoints.db"):
+    """Option 3: Async SQLite checkpointer (for ainvoke / astream)
 
-# Create research sub-agent
-research_sub_agent = {
-    "name": "researcher",
-    "description": "Delegate research tasks to this researcher sub-agent. Use this for conducting web searches and gathering information. Only give this researcher one specific topic at a time.",
-    "system_prompt": RESEARCHER_INSTRUCTIONS.format(date=current_date),
-    "tools": [tavily_search, think_tool],
-}
-
-# Model configuration
-model_provider = os.getenv("MODEL_PROVIDER", "openrouter").lower()
-
-if model_provider == "ollama":
-    from langchain_ollama import ChatOllama
-    model = ChatOllama(
-        model=os.getenv("OLLAMA_MODEL", "llama3.2"),
-        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-        temperature=0.0,
-    )
-    print(f"✓ Using Ollama model: {os.getenv('OLLAMA_MODEL', 'llama3.2')}")
+    - Same database file and format as Option 2
+    - Required for async agent calls - SqliteSaver is sync-only
+    - Async context manager: the connection is closed on exit
 
-elif model_provider == "anthropic":
-    model = init_chat_model(
-        model=f"anthropic:{os.getenv('ANTHROPIC_MODEL', 'claude-sonnet-4-5-20250929')}",
-        temperature=0.0,
-    )
-    print(f"✓ Using Anthropic model: {os.getenv('ANTHROPIC_MODEL', 'claude-sonnet-4-5-20250929')}")
-
-else:  # Default to openrouter
-    model = init_chat_model(
-        model=os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-120b:free"),
-        model_provider="openai",
-        temperature=0.0,
-        api_key=os.getenv("OPENROUTER_API_KEY"),
-        base_url="https://openrouter.ai/api/v1",
-        model_kwargs={
-            "extra_headers": {
-                "HTTP-Referer": "https://github.com/alanxu/deepagents-quickstarts",
-                "X-Title": "Deep Research Agent",
-            }
-        },
-    )
-    print(f"✓ Using OpenRouter model: {os.getenv('OPENROUTER_MODEL', 'openai/gpt-oss-120b:free')}")
+    Args:
+        db_path: Path to the SQLite database file
+    """
+    return AsyncSqliteSaver.from_conn_string(db_path)
 
 
 # ============================================================================
 # CREATE AGENT WITH CHECKPOINTER
 # ============================================================================
 
+CHECKPOINT_DB = "./research_checkpoints.db"
+
 # Choose your checkpointer
 # checkpointer = get_memory_checkpointer()  # Session-only
-checkpointer = get_persistent_checkpointer("./research_checkpoints.db")  # Persistent
+checkpointer = get_sqlite_checkpointer(CHECKPOINT_DB)  # Persistent
 
 agent = create_deep_agent(
     model=model,
     tools=[],
     system_prompt=INSTRUCTIONS,
     subagents=[research_sub_agent],
+    middleware=[context_compaction],
     checkpointer=checkpointer,  # ⭐ THIS ENABLES LONG-TERM MEMORY
 )
 
 print(f"✓ Agent created with persistent checkpointing")
-print(f"✓ Checkpoints saved to: ./research_checkpoints.db")
+print(f"✓ Checkpoints saved to: {CHECKPOINT_DB}")
+
+
+@asynccontextmanager
+async def async_agent():
+    """Yield the agent bound to an async SQLite checkpointer
+
+    Same graph and database as `agent`, usable with ainvoke / astream.
+    """
+    async with get_async_sqlite_checkpointer(CHECKPOINT_DB) as async_checkpointer:
+        yield agent.copy(update={"checkpointer": async_checkpointer})
+
+
+# ============================================================================
+# HISTORY SELECTION
+# ============================================================================
+
+def select_relevant_messages(messages, query: str, k: int = 20):
+    """Select the prior exchanges most relevant to a new query
+
+    History is reduced to exchanges of (user message, final answer) -
+    intermediate tool calls and results are dropped. The latest exchange is
+    always kept so follow-up questions keep their context, and the first
+    exchange is kept when it fits so the start of the prompt stays stable.
+    The remaining exchanges are ranked by similarity to the query and the
+    best ones kept, in their original order. At most k messages are returned.
+
+    Args:
+        messages: Prior messages of the thread
+        query: The new user query
+        k: Maximum number of messages to keep
+    """
+    exchanges = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            exchanges.append([message])
+        elif isinstance(message, AIMessage) and not message.tool_calls and exchanges:
+            # Keep only the last answer of each exchange
+            exchanges[-1][1:] = [message]
+
+    if not exchanges or k <= 0:
+        return []
+
+    # The latest exchange comes first; if it alone exceeds k, keep the end of
+    # it - the answer carries its context, and the trimmed state must still
+    # end with the model's reply
+    latest = len(exchanges) - 1
+    if len(exchanges[latest]) >= k:
+        return exchanges[latest][-k:]
+
+    selected, budget = {latest}, k - len(exchanges[latest])
+    if latest > 0 and len(exchanges[0]) <= budget:
+        selected.add(0)
+        budget -= len(exchanges[0])
+
+    query_vector = embed(query)
+    ranked = sorted(
+        range(1, latest),
+        key=lambda i: cosine_similarity(query_vector, embed(" ".join(m.text for m in exchanges[i]))),
+        reverse=True,
+    )
+    for i in ranked:
+        if len(exchanges[i]) <= budget:
+            selected.add(i)
+            budget -= len(exchanges[i])
+
+    return [m for i in sorted(selected) for m in exchanges[i]]
+
+
+async def trim_history(graph, config, query: str, k: int = 20):
+    """Trim a thread longer than k messages to the exchanges relevant to query"""
+    messages = (await graph.aget_state(config)).values.get("messages", [])
+    if len(messages) > k:
+        relevant = select_relevant_messages(messages, query, k=k)
+        await graph.aupdate_state(
+            config,
+            {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *relevant]},
+        )
 
 
 # ============================================================================
 # USAGE EXAMPLES
 # ============================================================================
 
-def run_new_conversation(query: str, thread_id: str):
+async def run_new_conversation(query: str, thread_id: str):
     """Start a new conversation with a specific thread ID"""
     config = {"configurable": {"thread_id": thread_id}}
 
@@ -167,15 +178,21 @@ def run_new_conversation(query: str, thread_id: str):
     print(f"Query: {query}")
     print(f"{'='*80}\n")
 
-    result = agent.invoke(
-        {"messages": [("user", query)]},
-        config=config
-    )
+    async with async_agent() as graph:
+        result = await graph.ainvoke(
+            {"messages": [("user", query)]},
+            config=config
+        )
     return result
 
 
-def resume_conversation(thread_id: str, new_query: str):
-    """Resume an existing conversation by thread ID"""
+async def resume_conversation(thread_id: str, new_query: str, k: int = 20):
+    """Resume an existing conversation by thread ID
+
+    Threads longer than k messages are first trimmed to the prior exchanges
+    most relevant to the new query (see select_relevant_messages). Earlier
+    checkpoints keep the full history.
+    """
     config = {"configurable": {"thread_id": thread_id}}
 
     print(f"\n{'='*80}")
@@ -183,30 +200,78 @@ def resume_conversation(thread_id: str, new_query: str):
     print(f"New query: {new_query}")
     print(f"{'='*80}\n")
 
-    # The agent automatically loads previous messages from checkpointer
-    result = agent.invoke(
-        {"messages": [("user", new_query)]},
-        config=config
-    )
+    async with async_agent() as graph:
+        await trim_history(graph, config, new_query, k=k)
+
+        # The agent automatically loads previous messages from checkpointer
+        result = await graph.ainvoke(
+            {"messages": [("user", new_query)]},
+            config=config
+        )
     return result
 
 
-def list_conversation_history(thread_id: str):
-    """View all checkpoints for a thread"""
+async def stream_conversation(query: str, thread_id: str, k: int = 20):
+    """Send a query on a new or existing thread, printing the reply as it streams
+
+    Only the main agent's tokens are printed - sub-agent output reaches the
+    user through the main agent's final report.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+
+    async with async_agent() as graph:
+        await trim_history(graph, config, query, k=k)
+
+        # astream_events fills in the default recursion_limit (25), overriding
+        # the graph's own limit - pass the graph's limit through explicitly
+        async for event in graph.astream_events(
+            {"messages": [("user", query)]},
+            config={**config, "recursion_limit": graph.config.get("recursion_limit", 1000)},
+            version="v2",
+        ):
+            if event["event"] != "on_chat_model_stream":
+                continue
+            # Only the main agent's model node - skips summarization calls in
+            # middleware nodes and sub-agents in nested namespaces
+            # ("tools:<id>|model:<id>")
+            metadata = event["metadata"]
+            if metadata.get("langgraph_node") != "model":
+                continue
+            if "|" in metadata.get("langgraph_checkpoint_ns", ""):
+                continue
+            text = event["data"]["chunk"].text
+            if text:
+                print(text, end="", flush=True)
+        print()
+
+        state = await graph.aget_state(config)
+    return state.values
+
+
+def list_conversation_history(thread_id: str, limit: int = 50):
+    """View the most recent checkpoints for a thread
+
+    Only checkpoint IDs and metadata are shown, so listing doesn't walk the
+    message lists stored in each checkpoint.
+
+    Args:
+        thread_id: Thread to inspect
+        limit: Maximum number of checkpoints to list, newest first
+    """
     config = {"configurable": {"thread_id": thread_id}}
 
     print(f"\n{'='*80}")
     print(f"Conversation history (thread: {thread_id})")
     print(f"{'='*80}\n")
 
-    # List all checkpoints
-    checkpoints = list(checkpointer.list(config))
-
-    for i, checkpoint in enumerate(checkpoints):
+    # List the newest checkpoints - the saver applies the limit in its query
+    checkpoints = []
+    for i, checkpoint in enumerate(checkpointer.list(config, limit=limit)):
         print(f"Checkpoint {i+1}:")
         print(f"  ID: {checkpoint.config['configurable']['checkpoint_id']}")
-        print(f"  Messages: {len(checkpoint.checkpoint.get('channel_values', {}).get('messages', []))}")
+        print(f"  Step: {checkpoint.metadata.get('step')} ({checkpoint.metadata.get('source')})")
         print()
+        checkpoints.append(checkpoint)
 
     return checkpoints
 
@@ -230,22 +295,23 @@ def get_conversation_state(thread_id: str):
 # EXAMPLE USAGE
 # ============================================================================
 
-if __name__ == "__main__":
+async def main():
+    """Run the usage examples"""
     # Example 1: Start a new research session
-    result1 = run_new_conversation(
+    await run_new_conversation(
         query="Research the history of quantum computing",
         thread_id="research-quantum-001"
     )
 
     # Example 2: Continue the same research session later
     # (even after restarting the script!)
-    result2 = resume_conversation(
+    await resume_conversation(
         thread_id="research-quantum-001",
         new_query="Now compare quantum computing with classical computing"
     )
 
     # Example 3: Start a different research session
-    result3 = run_new_conversation(
+    await run_new_conversation(
         query="Research the latest trends in AI",
         thread_id="research-ai-001"
     )
@@ -255,3 +321,13 @@ if __name__ == "__main__":
 
     # Example 5: Check current state
     get_conversation_state("research-quantum-001")
+
+
+if __name__ == "__main__":
+    # Use uvloop for the event loop where available (not supported on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """Simple demo of long-term memory and session resumption."""
 
+import asyncio
 import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
@@ -9,11 +10,12 @@ from agent_with_memory import (
     agent,
     run_new_conversation,
     resume_conversation,
+    stream_conversation,
     list_conversation_history,
     get_conversation_state,
 )
 
-def demo_basic_persistence():
+async def demo_basic_persistence():
     """Demo 1: Basic persistence - conversation survives restart"""
     print("\n" + "="*80)
     print("DEMO 1: Basic Persistence")
@@ -23,7 +25,7 @@ def demo_basic_persistence():
 
     # Session 1: Start research
     print("\n📝 Starting research on quantum computing...")
-    run_new_conversation(
+    await run_new_conversation(
         query="What is quantum computing? Give me a brief overview.",
         thread_id=thread_id
     )
@@ -33,7 +35,7 @@ def demo_basic_persistence():
 
     # Session 2: Continue research (can be after restart)
     print("\n📝 Continuing research...")
-    resume_conversation(
+    await resume_conversation(
         thread_id=thread_id,
         new_query="What are the main applications?"
     )
@@ -41,7 +43,7 @@ def demo_basic_persistence():
     print("\n✅ Session 2 complete.")
 
 
-def demo_multiple_threads():
+async def demo_multiple_threads():
     """Demo 2: Multiple independent conversations"""
     print("\n" + "="*80)
     print("DEMO 2: Multiple Independent Threads")
@@ -49,21 +51,21 @@ def demo_multiple_threads():
 
     # Research on quantum computing
     print("\n📝 Thread 1: Quantum Computing")
-    run_new_conversation(
+    await run_new_conversation(
         query="Brief history of quantum computing",
         thread_id="topic-quantum"
     )
 
     # Research on AI (completely separate)
     print("\n📝 Thread 2: Artificial Intelligence")
-    run_new_conversation(
+    await run_new_conversation(
         query="Brief history of artificial intelligence",
         thread_id="topic-ai"
     )
 
     # Continue quantum thread
     print("\n📝 Back to Thread 1: Quantum Computing")
-    resume_conversation(
+    await resume_conversation(
         thread_id="topic-quantum",
         new_query="Who are the key researchers?"
     )
@@ -71,7 +73,7 @@ def demo_multiple_threads():
     print("\n✅ Both threads maintained separately!")
 
 
-def demo_history_inspection():
+async def demo_history_inspection():
     """Demo 3: Inspect conversation history"""
     print("\n" + "="*80)
     print("DEMO 3: History Inspection")
@@ -80,12 +82,12 @@ def demo_history_inspection():
     thread_id = "demo-inspection-001"
 
     # Have a conversation
-    run_new_conversation(
+    await run_new_conversation(
         query="Tell me about LangGraph",
         thread_id=thread_id
     )
 
-    resume_conversation(
+    await resume_conversation(
         thread_id=thread_id,
         new_query="What are its main features?"
     )
@@ -98,7 +100,7 @@ def demo_history_inspection():
     get_conversation_state(thread_id)
 
 
-def interactive_session():
+async def interactive_session():
     """Demo 4: Interactive session"""
     print("\n" + "="*80)
     print("DEMO 4: Interactive Session")
@@ -111,7 +113,6 @@ def interactive_session():
     print(f"\n💡 Using thread ID: {thread_id}")
     print("💡 Type 'quit' to exit, 'history' to see checkpoints, 'state' to see current state\n")
 
-    first_query = True
     while True:
         query = input("\n🔵 You: ").strip()
 
@@ -131,16 +132,13 @@ def interactive_session():
             continue
 
         try:
-            if first_query:
-                run_new_conversation(query, thread_id)
-                first_query = False
-            else:
-                resume_conversation(thread_id, query)
+            print("\n🤖 Agent: ", end="", flush=True)
+            await stream_conversation(query, thread_id)
         except Exception as e:
             print(f"\n❌ Error: {e}")
 
 
-def main():
+async def main():
     """Main demo menu"""
     print("\n" + "="*80)
     print("LONG-TERM MEMORY & SESSION RESUMPTION DEMO")
@@ -157,17 +155,17 @@ def main():
     choice = input("\nSelect demo (1-5, q): ").strip()
 
     if choice == '1':
-        demo_basic_persistence()
+        await demo_basic_persistence()
     elif choice == '2':
-        demo_multiple_threads()
+        await demo_multiple_threads()
     elif choice == '3':
-        demo_history_inspection()
+        await demo_history_inspection()
     elif choice == '4':
-        interactive_session()
+        await interactive_session()
     elif choice == '5':
-        demo_basic_persistence()
-        demo_multiple_threads()
-        demo_history_inspection()
+        await demo_basic_persistence()
+        await demo_multiple_threads()
+        await demo_history_inspection()
     elif choice.lower() == 'q':
         print("\n👋 Goodbye!")
         return
@@ -182,4 +180,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Use uvloop for the event loop where available (not supported on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -12,10 +12,38 @@ Prerequisites:
    $ uv run python langgraph_client_example.py
 """
 
-from langgraph_sdk import get_client
+from langgraph_sdk import get_client, get_sync_client
+from langgraph_sdk.errors import NotFoundError
+import asyncio
 import time
 import sys
 
+SERVER_URL = "http://localhost:8123"
+
+# Shared client so every example reuses the same connection pool
+_CLIENT = None
+
+
+def _get_client():
+    """Return the shared synchronous LangGraph client, creating it on first use.
+
+    Note: get_client() returns the async client; the examples here are
+    synchronous, so they use get_sync_client().
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = get_sync_client(url=SERVER_URL)
+    return _CLIENT
+
+
+def _thread_exists(thread_id):
+    """Return whether the server has a thread with this id (single lookup)."""
+    try:
+        _get_client().threads.get(thread_id=thread_id)
+        return True
+    except NotFoundError:
+        return False
+
 
 def print_section(title):
     """Print a formatted section header."""
@@ -24,46 +52,118 @@ def print_section(title):
     print("="*80 + "\n")
 
 
+def token_text(chunk):
+    """Return the text of a main-agent token from a "messages-tuple" stream part.
+
+    Args:
+        chunk: Stream part yielded by client.runs.stream
+
+    Returns:
+        The token text, or None for other events, tool output, summaries, and
+        sub-agent tokens
+    """
+    if chunk.event != "messages":
+        return None
+    message, metadata = chunk.data
+    # Summarization runs in middleware nodes; only the model node is the reply
+    if metadata.get("langgraph_node") != "model":
+        return None
+    # Sub-agents run inside the task tool, so their namespace is nested
+    if "|" in metadata.get("langgraph_checkpoint_ns", ""):
+        return None
+    if message.get("type") != "AIMessageChunk":
+        return None
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    # Anthropic models stream content as a list of blocks when tools are bound
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "")
+            for block in content
+            if isinstance(block, dict) and block.get("type") == "text"
+        )
+    return None
+
+
+class StreamPrinter:
+    """Buffer streamed text and write it to stdout in batches.
+
+    Printing every token with flush=True costs one write per token; this
+    flushes at most once per `interval` seconds instead. Call write for every
+    stream chunk, even ones without text, so queued text is not held back
+    while the agent is busy with tools or sub-agents.
+    """
+
+    def __init__(self, interval=0.05):
+        """Initialize the printer.
+
+        Args:
+            interval: Minimum seconds between writes to stdout
+        """
+        self.interval = interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def write(self, text):
+        """Queue text (if any), flushing if the interval has elapsed."""
+        if text:
+            self.buffer.append(text)
+        if self.buffer and time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Write any queued text to stdout."""
+        if self.buffer:
+            sys.stdout.write("".join(self.buffer))
+            sys.stdout.flush()
+            self.buffer.clear()
+        self.last_flush = time.monotonic()
+
+
 def example_basic_thread():
     """Example 1: Basic thread creation and resumption"""
     print_section("Example 1: Basic Thread Usage")
 
-    client = get_client(url="http://localhost:8123")
+    client = _get_client()
 
     # Start a new conversation with specific thread_id
     thread_id = "example-basic-001"
     print(f"📝 Starting conversation (thread: {thread_id})")
 
-    run = client.runs.create(
-        assistant_id="research",
+    # Stream the run; it is complete when the stream ends
+    status = "success"
+    for chunk in client.runs.stream(
         thread_id=thread_id,
+        assistant_id="research",
         input={
             "messages": [
                 {"role": "user", "content": "What is quantum computing? Give a brief overview."}
             ]
         },
         stream_mode=["updates"]
-    )
-
-    # Wait for completion
-    run = client.runs.wait(run['run_id'])
-    print(f"✅ Run completed: {run['status']}")
+    ):
+        if chunk.event == "error":
+            status = "error"
+    print(f"✅ Run completed: {status}")
 
     # Resume the conversation
     print(f"\n📝 Resuming conversation (same thread: {thread_id})")
 
-    run = client.runs.create(
-        assistant_id="research",
+    status = "success"
+    for chunk in client.runs.stream(
         thread_id=thread_id,  # Same thread_id = resume
+        assistant_id="research",
         input={
             "messages": [
                 {"role": "user", "content": "What are its main applications?"}
             ]
-        }
-    )
-
-    run = client.runs.wait(run['run_id'])
-    print(f"✅ Run completed: {run['status']}")
+        },
+        stream_mode=["updates"]
+    ):
+        if chunk.event == "error":
+            status = "error"
+    print(f"✅ Run completed: {status}")
     print(f"💡 Thread '{thread_id}' now has full conversation history!")
 
 
@@ -71,12 +171,13 @@ def example_streaming():
     """Example 2: Streaming responses"""
     print_section("Example 2: Streaming Responses")
 
-    client = get_client(url="http://localhost:8123")
+    client = _get_client()
 
     thread_id = "example-streaming-001"
     print(f"📝 Streaming conversation (thread: {thread_id})")
 
     # Stream the response
+    out = StreamPrinter()
     for chunk in client.runs.stream(
         assistant_id="research",
         thread_id=thread_id,
@@ -85,11 +186,11 @@ def example_streaming():
                 {"role": "user", "content": "Tell me about LangGraph"}
             ]
         },
-        stream_mode=["updates"]
+        stream_mode=["messages-tuple"]
     ):
-        # Print each update as it arrives
-        if chunk.get("data"):
-            print(".", end="", flush=True)
+        # Print tokens as they arrive
+        out.write(token_text(chunk))
+    out.flush()
 
     print("\n✅ Streaming complete!")
 
@@ -98,46 +199,47 @@ def example_thread_inspection():
     """Example 3: Inspect thread state"""
     print_section("Example 3: Thread State Inspection")
 
-    client = get_client(url="http://localhost:8123")
+    client = _get_client()
 
     thread_id = "example-inspect-001"
 
     # Create conversation
     print(f"📝 Creating conversation (thread: {thread_id})")
-    run = client.runs.create(
-        assistant_id="research",
+    client.runs.wait(
         thread_id=thread_id,
+        assistant_id="research",
         input={
             "messages": [
                 {"role": "user", "content": "Research artificial intelligence"}
             ]
         }
     )
-    client.runs.wait(run['run_id'])
 
     # Inspect thread state
     print(f"\n🔍 Inspecting thread state...")
     state = client.threads.get_state(thread_id=thread_id)
+    messages = state['values']['messages']
 
-    print(f"   Messages: {len(state['values']['messages'])}")
-    print(f"   Files: {list(state['values'].get('files', {}).keys())}")
+    print(f"   Messages: {len(messages)}")
+    print(f"   Files: {', '.join(state['values'].get('files', {})) or 'none'}")
 
-    # Print messages
+    # Print messages (they come back from the server as plain dicts)
     print(f"\n📜 Message history:")
-    for i, msg in enumerate(state['values']['messages'][-5:], 1):  # Last 5 messages
-        role = getattr(msg, 'type', 'unknown')
-        content = getattr(msg, 'content', str(msg))
+    for i, msg in enumerate(messages[-5:], 1):  # Last 5 messages
+        role = msg.get('type', 'unknown')
+        content = msg.get('content', str(msg))
         # Truncate long content
         if isinstance(content, str) and len(content) > 100:
             content = content[:100] + "..."
         print(f"   {i}. [{role}]: {content}")
 
 
-def example_multiple_threads():
-    """Example 4: Multiple independent threads"""
+async def example_multiple_threads():
+    """Example 4: Multiple independent threads (run concurrently)"""
     print_section("Example 4: Multiple Independent Threads")
 
-    client = get_client(url="http://localhost:8123")
+    # The async client is bound to this event loop, so it is not shared
+    client = get_client(url=SERVER_URL)
 
     threads = [
         ("quantum-topic", "What is quantum computing?"),
@@ -150,18 +252,22 @@ def example_multiple_threads():
     for thread_id, query in threads:
         print(f"   Thread '{thread_id}': {query}")
 
-        run = client.runs.create(
-            assistant_id="research",
-            thread_id=thread_id,
-            input={"messages": [{"role": "user", "content": query}]}
-        )
-        client.runs.wait(run['run_id'])
+    # Threads are independent, so run them all at once
+    async with client:
+        await asyncio.gather(*[
+            client.runs.wait(
+                thread_id=thread_id,
+                assistant_id="research",
+                input={"messages": [{"role": "user", "content": query}]}
+            )
+            for thread_id, query in threads
+        ])
 
-    print("\n✅ All threads created!")
+        print("\n✅ All threads created!")
 
-    # List all threads
-    print("\n🔍 Listing all threads:")
-    all_threads = client.threads.list()
+        # List all threads
+        print("\n🔍 Listing all threads:")
+        all_threads = await client.threads.search()
 
     for thread in all_threads:
         tid = thread['thread_id']
@@ -172,45 +278,88 @@ def example_thread_cleanup():
     """Example 5: Thread cleanup"""
     print_section("Example 5: Thread Cleanup")
 
-    client = get_client(url="http://localhost:8123")
+    client = _get_client()
 
     # Create a temporary thread
     temp_thread = "temp-thread-to-delete"
 
     print(f"📝 Creating temporary thread: {temp_thread}")
-    run = client.runs.create(
-        assistant_id="research",
+    client.runs.wait(
         thread_id=temp_thread,
+        assistant_id="research",
         input={"messages": [{"role": "user", "content": "Hello"}]}
     )
-    client.runs.wait(run['run_id'])
 
-    # List threads before deletion
-    print(f"\n🔍 Threads before deletion:")
-    threads_before = [t['thread_id'] for t in client.threads.list()]
-    print(f"   Total: {len(threads_before)}")
-    if temp_thread in threads_before:
+    # Check the thread before deletion
+    print(f"\n🔍 Before deletion:")
+    if _thread_exists(temp_thread):
         print(f"   ✓ '{temp_thread}' exists")
 
     # Delete the thread
     print(f"\n🗑️  Deleting thread: {temp_thread}")
     client.threads.delete(thread_id=temp_thread)
 
-    # List threads after deletion
-    print(f"\n🔍 Threads after deletion:")
-    threads_after = [t['thread_id'] for t in client.threads.list()]
-    print(f"   Total: {len(threads_after)}")
-    if temp_thread not in threads_after:
+    # Check the thread after deletion
+    print(f"\n🔍 After deletion:")
+    if not _thread_exists(temp_thread):
         print(f"   ✓ '{temp_thread}' deleted successfully")
 
 
-def example_interactive():
-    """Example 6: Interactive session"""
+async def _load_state(session):
+    """Return the session's thread state, fetching it only if not cached."""
+    if session["state"] is None:
+        session["state"] = await session["client"].threads.get_state(
+            thread_id=session["thread_id"]
+        )
+    return session["state"]
+
+
+async def _cmd_quit(session):
+    """Handle 'quit': end the session."""
+    print("\n👋 Goodbye!")
+    return True
+
+
+async def _cmd_state(session):
+    """Handle 'state': show message and file counts."""
+    state = await _load_state(session)
+    print(f"\n📊 Thread State:")
+    print(f"   Messages: {len(state['values']['messages'])}")
+    print(f"   Files: {list(state['values'].get('files', {}).keys())}\n")
+
+
+async def _cmd_history(session):
+    """Handle 'history': show every message in the thread."""
+    state = await _load_state(session)
+    print(f"\n📜 Message History:")
+    for i, msg in enumerate(state['values']['messages'], 1):
+        # Messages come back from the server as plain dicts
+        role = msg.get('type', 'unknown')
+        content = msg.get('content', str(msg))
+        if isinstance(content, str) and len(content) > 80:
+            content = content[:80] + "..."
+        print(f"   {i}. [{role}]: {content}")
+    print()
+
+
+# Interactive commands; a handler returns True to end the session
+COMMANDS = {
+    "quit": _cmd_quit,
+    "state": _cmd_state,
+    "history": _cmd_history,
+}
+
+
+async def example_interactive():
+    """Example 6: Interactive session (async client)"""
     print_section("Example 6: Interactive Session")
 
-    client = get_client(url="http://localhost:8123")
+    # The async client is bound to this event loop, so it is not shared
+    client = get_client(url=SERVER_URL)
 
-    thread_id = input("Enter thread ID (or press Enter for 'interactive-session'): ").strip()
+    thread_id = (await asyncio.to_thread(
+        input, "Enter thread ID (or press Enter for 'interactive-session'): "
+    )).strip()
     if not thread_id:
         thread_id = "interactive-session"
 
@@ -218,51 +367,43 @@ def example_interactive():
     print("💡 Type 'quit' to exit, 'state' to see thread state")
     print("💡 Type 'history' to see message history\n")
 
-    while True:
-        query = input("🔵 You: ").strip()
-
-        if not query:
-            continue
-
-        if query.lower() == 'quit':
-            print("\n👋 Goodbye!")
-            break
-
-        if query.lower() == 'state':
-            state = client.threads.get_state(thread_id=thread_id)
-            print(f"\n📊 Thread State:")
-            print(f"   Messages: {len(state['values']['messages'])}")
-            print(f"   Files: {list(state['values'].get('files', {}).keys())}\n")
-            continue
-
-        if query.lower() == 'history':
-            state = client.threads.get_state(thread_id=thread_id)
-            print(f"\n📜 Message History:")
-            for i, msg in enumerate(state['values']['messages'], 1):
-                role = getattr(msg, 'type', 'unknown')
-                content = getattr(msg, 'content', str(msg))
-                if isinstance(content, str) and len(content) > 80:
-                    content = content[:80] + "..."
-                print(f"   {i}. [{role}]: {content}")
-            print()
-            continue
-
-        # Send message
-        print("🤖 Agent: ", end="", flush=True)
-
-        try:
-            for chunk in client.runs.stream(
-                assistant_id="research",
-                thread_id=thread_id,
-                input={"messages": [{"role": "user", "content": query}]},
-                stream_mode=["updates"]
-            ):
-                print(".", end="", flush=True)
+    async with client:
+        # "state" caches the last fetched thread state; only a run changes it
+        session = {"client": client, "thread_id": thread_id, "state": None}
+
+        while True:
+            # Read input in a worker thread so the event loop keeps running
+            query = (await asyncio.to_thread(input, "🔵 You: ")).strip()
+
+            if not query:
+                continue
+
+            handler = COMMANDS.get(query.lower())
+            if handler:
+                if await handler(session):
+                    break
+                continue
+
+            # Send message; the cached state is stale after this run
+            session["state"] = None
+            print("🤖 Agent: ", end="", flush=True)
+
+            out = StreamPrinter()
+            try:
+                async for chunk in client.runs.stream(
+                    assistant_id="research",
+                    thread_id=thread_id,
+                    input={"messages": [{"role": "user", "content": query}]},
+                    stream_mode=["messages-tuple"]
+                ):
+                    out.write(token_text(chunk))
 
-            print("\n")
+                out.flush()
+                print("\n")
 
-        except Exception as e:
-            print(f"\n❌ Error: {e}\n")
+            except Exception as e:
+                out.flush()
+                print(f"\n❌ Error: {e}\n")
 
 
 def main():
@@ -273,10 +414,10 @@ def main():
 
     # Check if server is running
     try:
-        client = get_client(url="http://localhost:8123")
-        # Try to list threads to verify connection
-        client.threads.list()
-        print("\n✅ Connected to LangGraph server at http://localhost:8123")
+        client = _get_client()
+        # Cheap request to verify connection (doesn't scale with stored threads)
+        client.assistants.search(limit=1)
+        print(f"\n✅ Connected to LangGraph server at {SERVER_URL}")
     except Exception as e:
         print("\n❌ Cannot connect to LangGraph server!")
         print("   Make sure the server is running:")
@@ -303,16 +444,16 @@ def main():
     elif choice == '3':
         example_thread_inspection()
     elif choice == '4':
-        example_multiple_threads()
+        asyncio.run(example_multiple_threads())
     elif choice == '5':
         example_thread_cleanup()
     elif choice == '6':
-        example_interactive()
+        asyncio.run(example_interactive())
     elif choice == '7':
         example_basic_thread()
         example_streaming()
         example_thread_inspection()
-        example_multiple_threads()
+        asyncio.run(example_multiple_threads())
         example_thread_cleanup()
     elif choice.lower() == 'q':
         print("\n👋 Goodbye!")
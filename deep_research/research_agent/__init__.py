@@ -9,10 +9,13 @@ from research_agent.prompts import (
     RESEARCH_WORKFLOW_INSTRUCTIONS,
     SUBAGENT_DELEGATION_INSTRUCTIONS,
 )
-from research_agent.tools import tavily_search, think_tool
+from research_agent.tools import read_search_result, tavily_search, think_tool
+from research_agent.tools_cached import tavily_search_cached
 
 __all__ = [
+    "read_search_result",
     "tavily_search",
+    "tavily_search_cached",
     "think_tool",
     "RESEARCHER_INSTRUCTIONS",
     "RESEARCH_WORKFLOW_INSTRUCTIONS",
@@ -0,0 +1,275 @@
+"""Shared Research Agent Configuration.
+
+This module builds the prompts, research sub-agent, model and middleware shared
+by the LangGraph deployment (agent.py) and the persistent agent
+(agent_with_memory.py). It only configures objects - it compiles no graph and
+prints nothing, so importing it is cheap.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime
+from types import MappingProxyType
+from typing import Final
+
+import langchain
+from dotenv import load_dotenv
+from langchain.agents.middleware import AgentMiddleware, SummarizationMiddleware
+from langchain_core.callbacks.base import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+
+from research_agent.prompts import (
+    RESEARCH_WORKFLOW_INSTRUCTIONS,
+    RESEARCHER_INSTRUCTIONS,
+    SUBAGENT_DELEGATION_INSTRUCTIONS,
+)
+from research_agent.tools import read_search_result, think_tool
+from research_agent.tools_cached import tavily_search_cached
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean switch from the environment.
+
+    Args:
+        name: Environment variable to read
+
+    Returns:
+        True for 1/true/yes/on (any case), False when unset or anything else
+    """
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+# Debug output serializes every prompt and response - opt in with LC_DEBUG=1
+LC_DEBUG = _env_flag("LC_DEBUG")
+
+# Per-call prompt cache usage - opt in with LOG_CACHE_USAGE=1
+LOG_CACHE_USAGE = _env_flag("LOG_CACHE_USAGE")
+
+if LC_DEBUG:
+    # Enable debug mode to see raw LLM responses
+    langchain.debug = True
+
+    # Configure logging to show more details
+    logging.basicConfig(level=logging.DEBUG)
+    logging.getLogger("langchain").setLevel(logging.DEBUG)
+    logging.getLogger("langgraph").setLevel(logging.DEBUG)
+
+
+class RawResponseLogger(BaseCallbackHandler):
+    """Callback that prints raw LLM inputs and outputs when LC_DEBUG is set."""
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        """Print the prompts sent to the model.
+
+        Args:
+            serialized: Serialized model that is starting
+            prompts: Prompts sent to the model
+            **kwargs: Additional callback arguments
+        """
+        if not LC_DEBUG:
+            return
+        print("\n" + "="*80)
+        print("🔵 RAW LLM INPUT:")
+        print("="*80)
+        for prompt in prompts:
+            print(prompt)
+        print("="*80 + "\n")
+
+    def on_llm_end(self, response, **kwargs):
+        """Print the raw model response, its generations and metadata.
+
+        Args:
+            response: Result returned by the model
+            **kwargs: Additional callback arguments
+        """
+        if not LC_DEBUG:
+            return
+        print("\n" + "="*80)
+        print("🟢 RAW LLM OUTPUT:")
+        print("="*80)
+        print(response)
+        print("\nGenerations:")
+        for gen in response.generations:
+            print(gen)
+        if hasattr(response, 'llm_output') and response.llm_output:
+            print("\nLLM Output metadata:")
+            print(response.llm_output)
+        print("="*80 + "\n")
+
+
+class CacheUsageLogger(BaseCallbackHandler):
+    """Callback that prints prompt cache usage for every LLM call."""
+
+    def on_llm_end(self, response, **kwargs):
+        """Print cache reads, cache writes and input tokens of the response.
+
+        Args:
+            response: Result returned by the model
+            **kwargs: Additional callback arguments
+        """
+        for generations in response.generations:
+            for gen in generations:
+                usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                details = usage.get("input_token_details", {})
+                print(
+                    f"💾 Prompt cache: {details.get('cache_read', 0)} read, "
+                    f"{details.get('cache_creation', 0)} written, "
+                    f"{usage.get('input_tokens', 0)} input tokens"
+                )
+
+
+class CurrentDateMiddleware(AgentMiddleware):
+    """Prepend today's date as a context message on every model call.
+
+    The date is not written to state and the system prompt stays static, so
+    the cached prompt prefix survives date changes and process restarts.
+    """
+
+    def _with_date(self, request):
+        context = HumanMessage(f"For context, today's date is {datetime.now():%Y-%m-%d}.")
+        return request.override(messages=[context, *request.messages])
+
+    def wrap_model_call(self, request, handler):
+        """Call the model with today's date prepended to the messages.
+
+        Args:
+            request: Model request to extend
+            handler: Next handler in the middleware chain
+
+        Returns:
+            The model response
+        """
+        return handler(self._with_date(request))
+
+    async def awrap_model_call(self, request, handler):
+        """Async version of wrap_model_call.
+
+        Args:
+            request: Model request to extend
+            handler: Next handler in the middleware chain
+
+        Returns:
+            The model response
+        """
+        return await handler(self._with_date(request))
+
+
+# Second summarization pass for the main agent with a much lower trigger than
+# the deepagents default (170K tokens). A separate class because create_agent
+# rejects two middleware with the same name
+class ContextCompactionMiddleware(SummarizationMiddleware):
+    """Summarize older messages once history passes a token budget.
+
+    The last messages are kept verbatim and the system prompt is untouched, so
+    the cached prompt prefix still hits.
+    """
+
+
+# Limits
+max_concurrent_research_units = 3
+max_researcher_iterations = 3
+max_context_tokens = 12000
+
+# Combine orchestrator instructions (RESEARCHER_INSTRUCTIONS only for sub-agents)
+INSTRUCTIONS = (
+    RESEARCH_WORKFLOW_INSTRUCTIONS
+    + "\n\n"
+    + "=" * 80
+    + "\n\n"
+    + SUBAGENT_DELEGATION_INSTRUCTIONS.format(
+        max_concurrent_research_units=max_concurrent_research_units,
+        max_researcher_iterations=max_researcher_iterations,
+    )
+)
+
+# Create research sub-agent - built once and read-only. The system prompt is
+# fully static so the cached prompt prefix stays byte-identical across days;
+# the date is supplied per call by CurrentDateMiddleware
+research_sub_agent: Final = MappingProxyType({
+    "name": "researcher",
+    "description": "Delegate research tasks to this researcher sub-agent. Use this for conducting web searches and gathering information. Only give this researcher one specific topic at a time.",
+    "system_prompt": RESEARCHER_INSTRUCTIONS,
+    "tools": [read_search_result, tavily_search_cached, think_tool],
+    "middleware": [CurrentDateMiddleware()],
+})
+
+# Fingerprint of the static prompts - if it differs between runs, the
+# provider-side prompt cache starts cold
+PROMPT_FINGERPRINT = hashlib.sha256(
+    (INSTRUCTIONS + RESEARCHER_INSTRUCTIONS).encode()
+).hexdigest()[:12]
+
+# Model Gemini 3
+# from langchain_google_genai import ChatGoogleGenerativeAI
+# model = ChatGoogleGenerativeAI(model="gemini-3-pro-preview", temperature=0.0)
+
+# === Dynamic Model Configuration based on MODEL_PROVIDER ===
+model_provider = os.getenv("MODEL_PROVIDER", "openrouter").lower()
+
+# Initialize callback for raw response logging
+raw_logger = RawResponseLogger()
+
+if model_provider == "ollama":
+    # Ollama (Local/Free)
+    from langchain_ollama import ChatOllama
+
+    model = ChatOllama(
+        model=os.getenv("OLLAMA_MODEL", "llama3.2"),
+        base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+        temperature=0.0,
+        # callbacks=[raw_logger],
+    )
+    model_description = f"Ollama model: {os.getenv('OLLAMA_MODEL', 'llama3.2')}"
+
+elif model_provider == "anthropic":
+    # Anthropic Claude (Paid)
+    from langchain.chat_models import init_chat_model
+
+    model = init_chat_model(
+        model=f"anthropic:{os.getenv('ANTHROPIC_MODEL', 'claude-sonnet-4-5-20250929')}",
+        temperature=0.0,
+    )
+    # Add callbacks after initialization
+    # model.callbacks = [raw_logger]
+    model_description = f"Anthropic model: {os.getenv('ANTHROPIC_MODEL', 'claude-sonnet-4-5-20250929')}"
+
+else:  # Default to openrouter
+    # OpenRouter (Free or Paid models)
+    from langchain.chat_models import init_chat_model
+
+    model = init_chat_model(
+        model=os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-120b:free"),
+        model_provider="openai",
+        temperature=0.0,
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url="https://openrouter.ai/api/v1",
+        model_kwargs={
+            "extra_headers": {
+                "HTTP-Referer": "https://github.com/alanxu/deepagents-quickstarts",
+                "X-Title": "Deep Research Agent",
+            }
+        },
+        # Ask OpenRouter for usage details, including cached prompt tokens
+        extra_body={"usage": {"include": True}},
+    )
+    # Add callbacks after initialization
+    # model.callbacks = [raw_logger]
+    model_description = f"OpenRouter model: {os.getenv('OPENROUTER_MODEL', 'openai/gpt-oss-120b:free')}"
+
+# Report prompt cache reads/writes on every call to verify cache hits
+if LOG_CACHE_USAGE:
+    model.callbacks = [CacheUsageLogger()]
+
+# Keep the main agent's history under max_context_tokens
+context_compaction = ContextCompactionMiddleware(
+    model=model,
+    trigger=("tokens", max_context_tokens),
+    keep=("messages", 6),
+)
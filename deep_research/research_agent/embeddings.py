@@ -0,0 +1,43 @@
+"""Text Embeddings.
+
+This module provides the lightweight text vectors shared by the search cache and
+the conversation history selector. Vectors are memoized, so text embedded once
+(a repeated query, an earlier exchange) is never recomputed.
+"""
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+# Words that carry no meaning for matching search queries
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to what when where which who why with".split()
+)
+
+
+@lru_cache(maxsize=4096)
+def embed(text: str) -> Mapping[str, float]:
+    """Embed text as an L2-normalized bag-of-words vector.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        Read-only mapping of token to weight, with unit length
+    """
+    tokens = [t for t in re.findall(r"\w+", text.lower()) if t not in STOPWORDS]
+    counts = Counter(tokens)
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    if not norm:
+        return MappingProxyType({})
+    return MappingProxyType({token: count / norm for token, count in counts.items()})
+
+
+def cosine_similarity(a: Mapping[str, float], b: Mapping[str, float]) -> float:
+    """Cosine similarity between two normalized vectors from `embed`."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(token, 0.0) for token, weight in a.items())
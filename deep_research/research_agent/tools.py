@@ -4,6 +4,12 @@ This module provides search and content processing utilities for the research ag
 using DuckDuckGo for free web search (or Tavily if you have an API key).
 """
 
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
 import httpx
 from langchain_core.tools import InjectedToolArg, tool
 from markdownify import markdownify
@@ -15,6 +21,64 @@ import urllib.parse
 # from tavily import TavilyClient
 # tavily_client = TavilyClient()
 
+# Shared HTTP client - reuses keep-alive connections across searches and page
+# fetches instead of paying TCP+TLS setup on every request
+http_client = httpx.Client(
+    headers={
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    },
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=30),
+)
+
+# Full search results, zlib-compressed and keyed by reference. Kept out of
+# messages (and so out of prompts and checkpoints) - researchers only see a
+# preview of each page and call read_search_result when they need the rest
+search_result_store: OrderedDict[str, bytes] = OrderedDict()
+search_result_lock = threading.Lock()
+MAX_STORED_RESULTS = 256
+PREVIEW_CHARS = 1000
+
+
+def store_search_result(text: str) -> str:
+    """Compress and store a full search result.
+
+    Args:
+        text: Full search result text
+
+    Returns:
+        Reference for read_search_result
+    """
+    ref = hashlib.sha256(text.encode()).hexdigest()[:12]
+    with search_result_lock:
+        search_result_store[ref] = zlib.compress(text.encode(), level=6)
+        search_result_store.move_to_end(ref)
+        while len(search_result_store) > MAX_STORED_RESULTS:
+            search_result_store.popitem(last=False)
+    return ref
+
+
+def search_result_available(response: str) -> bool:
+    """Check that the full result behind a tavily_search response is still stored.
+
+    A stored result is marked as recently used, so responses served from the
+    search cache keep their full result from being evicted.
+
+    Args:
+        response: Response text returned by tavily_search
+
+    Returns:
+        False if the response references a result that was evicted, else True
+    """
+    match = re.search(r"\(ref: (\w+)\)", response)
+    if match is None:
+        return True
+    ref = match.group(1)
+    with search_result_lock:
+        if ref not in search_result_store:
+            return False
+        search_result_store.move_to_end(ref)
+    return True
+
 
 def duckduckgo_search(query: str, max_results: int = 5) -> list[dict]:
     """Free web search using DuckDuckGo HTML search.
@@ -26,14 +90,10 @@ def duckduckgo_search(query: str, max_results: int = 5) -> list[dict]:
     Returns:
         List of search results with title and url
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
     try:
         # DuckDuckGo HTML search (no API key needed)
         search_url = f"https://html.duckduckgo.com/html/?q={urllib.parse.quote(query)}"
-        response = httpx.get(search_url, headers=headers, timeout=10.0, follow_redirects=True)
+        response = http_client.get(search_url, timeout=10.0, follow_redirects=True)
         response.raise_for_status()
 
         # Parse HTML results
@@ -68,12 +128,8 @@ def fetch_webpage_content(url: str, timeout: float = 10.0) -> str:
     Returns:
         Webpage content as markdown
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
     try:
-        response = httpx.get(url, headers=headers, timeout=timeout)
+        response = http_client.get(url, timeout=timeout)
         response.raise_for_status()
         return markdownify(response.text)
     except Exception as e:
@@ -90,7 +146,8 @@ def tavily_search(
 ) -> str:
     """Search the web for information on a given query.
 
-    Uses DuckDuckGo (free) to discover relevant URLs, then fetches and returns full webpage content as markdown.
+    Uses DuckDuckGo (free) to discover relevant URLs, then fetches webpage content as markdown and returns a preview of each page.
+    Use read_search_result with the returned reference to read the full pages.
     To use Tavily instead, uncomment the tavily_client lines at the top and use the commented code below.
 
     Args:
@@ -99,7 +156,7 @@ def tavily_search(
         topic: Topic filter - 'general', 'news', or 'finance' (default: 'general')
 
     Returns:
-        Formatted search results with full webpage content
+        Formatted search results with a preview of each webpage
     """
     # === OPTION 1: DuckDuckGo (FREE) - Currently active ===
     search_results = duckduckgo_search(query, max_results=max_results)
@@ -111,41 +168,69 @@ def tavily_search(
     #     topic=topic,
     # ).get("results", [])
 
-    # Fetch full content for each URL
+    # Fetch full content for each URL. max_results is injected (1 by default),
+    # so there is no fan-out here - parallel searches come from the model
+    # issuing several tool calls, which ToolNode already runs concurrently
     result_texts = []
+    preview_texts = []
     for result in search_results:
-        # DuckDuckGo format
+        # DuckDuckGo format (if using Tavily, the dict keys are the same)
         url = result.get("url")
         title = result.get("title")
+        if not url or not title:
+            continue
 
-        # Tavily format (if using Tavily, the dict keys are the same)
-        # url = result.get("url")
-        # title = result.get("title")
-
-        if url and title:
-            # Fetch webpage content
-            content = fetch_webpage_content(url)
-
-            result_text = f"""## {title}
+        content = fetch_webpage_content(url)
+        result_text = f"""## {title}
 **URL:** {url}
 
 {content}
 
 ---
 """
-            result_texts.append(result_text)
+        result_texts.append(result_text)
+
+        preview = content if len(content) <= PREVIEW_CHARS else content[:PREVIEW_CHARS] + "..."
+        preview_texts.append(f"""## {title}
+**URL:** {url}
+
+{preview}
+
+---
+""")
 
-    # Format final response
+    # Format final response - full content is stored, only previews are returned
     if result_texts:
-        response = f"""🔍 Found {len(result_texts)} result(s) for '{query}':
+        ref = store_search_result(chr(10).join(result_texts))
+        response = f"""🔍 Found {len(result_texts)} result(s) for '{query}' (ref: {ref}):
 
-{chr(10).join(result_texts)}"""
+{chr(10).join(preview_texts)}
+Call read_search_result with ref '{ref}' for the full page content."""
     else:
         response = f"🔍 No results found for '{query}'. Try a different search query."
 
     return response
 
 
+@tool(parse_docstring=True)
+def read_search_result(ref: str) -> str:
+    """Read the full webpage content of an earlier search.
+
+    tavily_search only returns a preview of each page. Use this when a preview looks relevant but doesn't contain enough detail.
+
+    Args:
+        ref: Result reference returned by tavily_search
+
+    Returns:
+        Full webpage content of the search results as markdown
+    """
+    with search_result_lock:
+        data = search_result_store.get(ref)
+    if data is None:
+        return f"No stored search result for ref '{ref}'. Run the search again."
+    return zlib.decompress(data).decode()
+
+
 @tool(parse_docstring=True)
 def think_tool(reflection: str) -> str:
     """Tool for strategic reflection on research progress and decision-making.
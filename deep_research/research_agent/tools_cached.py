@@ -0,0 +1,160 @@
+"""Cached Research Tools.
+
+This module wraps the research tools with a similarity cache so that repeated or
+near-duplicate searches (common across sub-agent iterations and resumed threads)
+are answered locally instead of re-fetching the same webpages.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Mapping
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from research_agent.embeddings import STOPWORDS, cosine_similarity, embed
+from research_agent.tools import search_result_available, tavily_search
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text and collapse whitespace."""
+    return " ".join(text.lower().split())
+
+
+def _key_terms(text: str) -> tuple[str, ...]:
+    """Numbers and capitalized names in a query, in order.
+
+    Bag-of-words similarity barely moves when only a year or a place changes,
+    so a similarity hit must agree on these exactly.
+    """
+    words = re.findall(r"\w+", text)
+    return tuple(
+        word.lower()
+        for i, word in enumerate(words)
+        if any(c.isdigit() for c in word) or (i > 0 and word[0].isupper())
+    )
+
+
+def _same_order(a: str, b: str) -> bool:
+    """Check that the content words two normalized queries share appear in the same order."""
+    a_tokens = [t for t in re.findall(r"\w+", a) if t not in STOPWORDS]
+    b_tokens = [t for t in re.findall(r"\w+", b) if t not in STOPWORDS]
+    shared = set(a_tokens) & set(b_tokens)
+    return [t for t in a_tokens if t in shared] == [t for t in b_tokens if t in shared]
+
+
+class SemanticToolCache:
+    """Similarity cache in front of a search tool.
+
+    Lookups first try an exact match on the normalized query, then fall back to
+    the most similar cached query with the same numbers and names (see
+    `_key_terms`) and word order. A hit at or above `threshold` returns the
+    stored response without calling the wrapped tool, unless `is_valid`
+    rejects it - then the entry is dropped and the tool runs again.
+    """
+
+    def __init__(
+        self,
+        tool: BaseTool,
+        threshold: float = 0.92,
+        ttl: float = 3600,
+        maxsize: int = 1024,
+        is_valid: Callable[[str], bool] | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            tool: Search tool to wrap (must accept query, max_results and topic)
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Seconds before a cached response expires
+            maxsize: Maximum number of cached responses
+            is_valid: Optional check that a cached response can still be served
+        """
+        self.tool = tool
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.is_valid = is_valid
+        # (normalized query, max_results, topic) -> (timestamp, vector, key terms, response)
+        self._entries: OrderedDict[
+            tuple, tuple[float, Mapping[str, float], tuple[str, ...], str]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(
+        self, key: tuple, vector: Mapping[str, float], terms: tuple[str, ...]
+    ) -> str | None:
+        """Return the cached response for an exact or similar query, if any."""
+        hit = self._find(key, vector, terms)
+        if hit is None:
+            return None
+        response = self._entries[hit][3]
+        if self.is_valid is not None and not self.is_valid(response):
+            del self._entries[hit]
+            return None
+        self._entries.move_to_end(hit)
+        return response
+
+    def _find(
+        self, key: tuple, vector: Mapping[str, float], terms: tuple[str, ...]
+    ) -> tuple | None:
+        """Return the key of the cached exact or most similar query, if any."""
+        now = time.monotonic()
+        expired = [k for k, (ts, _, _, _) in self._entries.items() if now - ts > self.ttl]
+        for k in expired:
+            del self._entries[k]
+
+        if key in self._entries:
+            return key
+
+        best_key, best_score = None, 0.0
+        for k, (_, cached_vector, cached_terms, _) in self._entries.items():
+            if k[1:] != key[1:] or cached_terms != terms:
+                continue
+            score = cosine_similarity(vector, cached_vector)
+            if score > best_score and _same_order(k[0], key[0]):
+                best_key, best_score = k, score
+
+        if best_key is not None and best_score >= self.threshold:
+            return best_key
+        return None
+
+    def __call__(self, query: str, max_results: int = 1, topic: str = "general") -> str:
+        """Run the wrapped tool, serving exact or similar queries from the cache."""
+        key = (_normalize(query), max_results, topic)
+        vector = embed(query)
+        terms = _key_terms(query)
+
+        with self._lock:
+            cached = self._lookup(key, vector, terms)
+        if cached is not None:
+            return cached
+
+        response = self.tool.func(query, max_results=max_results, topic=topic)
+
+        # Don't cache empty results - they are often transient search failures
+        if not response.startswith("🔍 No results found"):
+            with self._lock:
+                self._entries[key] = (time.monotonic(), vector, terms, response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return response
+
+    def as_tool(self) -> BaseTool:
+        """Expose the cache as a tool with the wrapped tool's name and schema."""
+        return StructuredTool.from_function(
+            func=self.__call__,
+            name=self.tool.name,
+            description=self.tool.description,
+            args_schema=self.tool.args_schema,
+        )
+
+
+# Responses only carry a preview and a ref to the full result, so a hit whose
+# full result was evicted from the result store is refetched
+tavily_search_cached = SemanticToolCache(
+    tavily_search, threshold=0.92, ttl=3600, is_valid=search_result_available
+).as_tool()
@@ -0,0 +1,16 @@
+"""Shared test setup.
+
+The example modules pick a model and open their checkpoint database at import
+time. Tests never call a model, so a placeholder key is enough, and the
+database is kept out of the source tree.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("MODEL_PROVIDER", "openrouter")
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+
+def pytest_sessionstart(session):
+    os.chdir(tempfile.mkdtemp(prefix="deep_research_tests_"))
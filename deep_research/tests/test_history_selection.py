@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+from deepagents import create_deep_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from agent_with_memory import select_relevant_messages, trim_history
+
+
+def exchange(question, answer, n):
+    """A user turn, one tool round trip and the final answer."""
+    return [
+        HumanMessage(question, id=f"h{n}"),
+        AIMessage("", tool_calls=[{"name": "think_tool", "args": {}, "id": f"c{n}"}], id=f"t{n}"),
+        ToolMessage("noted", tool_call_id=f"c{n}", id=f"r{n}"),
+        AIMessage(answer, id=f"a{n}"),
+    ]
+
+
+def conversation(*pairs):
+    return [m for n, (q, a) in enumerate(pairs) for m in exchange(q, a, n)]
+
+
+HISTORY = conversation(
+    ("Plan a trip to Japan", "Here is a two week itinerary for Japan"),
+    ("What is the capital of Peru?", "Lima is the capital of Peru"),
+    ("Best ramen in Tokyo?", "Ichiran and Fuunji serve the best ramen in Tokyo"),
+    ("How tall is Mount Everest?", "Mount Everest is 8849 metres tall"),
+    ("Thanks, that was helpful", "Glad to help"),
+)
+
+
+def texts(messages):
+    return [m.text for m in messages]
+
+
+def test_keeps_only_questions_and_final_answers():
+    selected = select_relevant_messages(HISTORY, "anything", k=100)
+
+    assert [m.id for m in selected] == ["h0", "a0", "h1", "a1", "h2", "a2", "h3", "a3", "h4", "a4"]
+
+
+def test_latest_exchange_always_kept():
+    # The latest exchange has nothing in common with the query
+    selected = select_relevant_messages(HISTORY, "ramen in Tokyo", k=6)
+
+    assert texts(selected) == [
+        "Plan a trip to Japan",
+        "Here is a two week itinerary for Japan",
+        "Best ramen in Tokyo?",
+        "Ichiran and Fuunji serve the best ramen in Tokyo",
+        "Thanks, that was helpful",
+        "Glad to help",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("k", "expected"),
+    [
+        (0, []),
+        (1, ["Glad to help"]),
+        (2, ["Thanks, that was helpful", "Glad to help"]),
+        (3, ["Thanks, that was helpful", "Glad to help"]),
+    ],
+)
+def test_small_k_keeps_end_of_latest_exchange(k, expected):
+    selected = select_relevant_messages(HISTORY, "ramen in Tokyo", k=k)
+
+    assert texts(selected) == expected
+    assert len(selected) <= k
+
+
+def test_interrupted_latest_exchange():
+    # The last run stopped after a tool call, before any final answer
+    messages = HISTORY + [
+        HumanMessage("Compare flights to Osaka", id="h5"),
+        AIMessage("", tool_calls=[{"name": "think_tool", "args": {}, "id": "c5"}], id="t5"),
+    ]
+
+    assert texts(select_relevant_messages(messages, "flights", k=1)) == ["Compare flights to Osaka"]
+    assert texts(select_relevant_messages(messages, "flights", k=3)) == [
+        "Plan a trip to Japan",
+        "Here is a two week itinerary for Japan",
+        "Compare flights to Osaka",
+    ]
+
+
+def test_compaction_summary_grouped_as_exchange():
+    # ContextCompactionMiddleware replaces older messages with a summary turn,
+    # and the preserved tail may start with the answer of a compacted exchange
+    messages = [
+        HumanMessage("Here is a summary of the conversation to date:\n\nJapan trip planning", id="s"),
+        AIMessage("Kyoto is best visited in spring", id="a-kept"),
+        *conversation(
+            ("Best ramen in Tokyo?", "Ichiran and Fuunji serve the best ramen in Tokyo"),
+            ("How tall is Mount Everest?", "Mount Everest is 8849 metres tall"),
+        ),
+    ]
+
+    selected = select_relevant_messages(messages, "Mount Everest height", k=4)
+
+    assert [m.id for m in selected] == ["s", "a-kept", "h1", "a1"]
+
+
+class EchoModel(BaseChatModel):
+    """Answers every call with the number of messages it was given."""
+
+    @property
+    def _llm_type(self):
+        return "echo"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(f"saw {len(messages)} messages"))])
+
+
+def test_trim_history_rewrites_long_threads():
+    graph = create_deep_agent(model=EchoModel(), tools=[], system_prompt="test", checkpointer=InMemorySaver())
+    config = {"configurable": {"thread_id": "trim"}}
+
+    async def run():
+        # Start the thread with a real run, then swap in the long history
+        await graph.ainvoke({"messages": [HumanMessage("Hello")]}, config)
+        await graph.aupdate_state(
+            config, {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *HISTORY]}, as_node="model"
+        )
+        await trim_history(graph, config, "ramen in Tokyo", k=6)
+        trimmed = (await graph.aget_state(config)).values["messages"]
+        # The trimmed thread still accepts the next turn
+        result = await graph.ainvoke({"messages": [HumanMessage("Flights to Osaka?")]}, config)
+        return trimmed, result["messages"]
+
+    trimmed, after = asyncio.run(run())
+
+    assert [m.id for m in trimmed] == ["h0", "a0", "h2", "a2", "h4", "a4"]
+    assert len(after) == 8
+    assert after[-2].text == "Flights to Osaka?"
+    assert isinstance(after[-1], AIMessage) and not after[-1].tool_calls
@@ -0,0 +1,52 @@
+import pytest
+
+import langgraph_client_example
+from langgraph_client_example import StreamPrinter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(langgraph_client_example.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_batches_writes_until_interval(clock, capsys):
+    out = StreamPrinter(interval=0.05)
+
+    out.write("Hello")
+    out.write(", ")
+    assert capsys.readouterr().out == ""
+
+    clock[0] += 0.1
+    out.write("world")
+    assert capsys.readouterr().out == "Hello, world"
+
+
+def test_chunks_without_text_flush_queued_text(clock, capsys):
+    out = StreamPrinter(interval=0.05)
+
+    out.write("Researching")
+    # Tool and sub-agent events carry no text for the main reply
+    out.write(None)
+    assert capsys.readouterr().out == ""
+
+    clock[0] += 0.1
+    out.write(None)
+    assert capsys.readouterr().out == "Researching"
+
+    clock[0] += 0.1
+    out.write(None)
+    out.write("")
+    assert capsys.readouterr().out == ""
+
+
+def test_flush_writes_remaining_text(clock, capsys):
+    out = StreamPrinter(interval=0.05)
+
+    out.write("Done")
+    out.flush()
+    out.flush()
+
+    assert capsys.readouterr().out == "Done"
+    assert out.buffer == []
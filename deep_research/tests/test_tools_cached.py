@@ -0,0 +1,154 @@
+import pytest
+from langchain_core.tools import StructuredTool
+
+from research_agent import tools_cached
+from research_agent.tools_cached import SemanticToolCache, _key_terms, _same_order
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def stub_tool(calls):
+    def search(query: str, max_results: int = 1, topic: str = "general") -> str:
+        """Stub search that records its calls."""
+        calls.append(query)
+        if query == "nothing":
+            return "🔍 No results found for 'nothing'."
+        return f"result {len(calls)} for {query}"
+
+    return StructuredTool.from_function(func=search, name="stub_search")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tools_cached.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_key_terms():
+    assert _key_terms("Flights from London to Paris in 2024") == ("london", "paris", "2024")
+    assert _key_terms("Python web frameworks") == ()
+
+
+def test_same_order():
+    assert _same_order("convert celsius to fahrenheit", "convert celsius into fahrenheit")
+    assert not _same_order("convert celsius to fahrenheit", "convert fahrenheit to celsius")
+
+
+def test_exact_hit(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool)
+
+    first = cache("Python web frameworks")
+
+    assert cache("  python   WEB frameworks ") == first
+    assert calls == ["Python web frameworks"]
+
+
+def test_similar_hit(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool)
+
+    first = cache("latest research on quantum error correction")
+
+    assert cache("latest research quantum error correction") == first
+    assert len(calls) == 1
+
+
+def test_word_order_miss(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool)
+
+    cache("convert celsius to fahrenheit")
+    cache("convert fahrenheit to celsius")
+    cache("flights from London to Paris")
+    cache("flights from Paris to London")
+
+    assert len(calls) == 4
+
+
+def test_year_miss(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool)
+    query = "most popular open source python web frameworks for building fast rest apis and microservices in production during {}"
+
+    # Similar enough for a hit on bag-of-words alone
+    assert tools_cached.cosine_similarity(
+        tools_cached.embed(query.format(2023)), tools_cached.embed(query.format(2024))
+    ) >= cache.threshold
+    cache(query.format(2023))
+    cache(query.format(2024))
+
+    assert len(calls) == 2
+
+
+def test_other_arguments_miss(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool)
+
+    cache("quantum error correction")
+    cache("quantum error correction", topic="news")
+    cache("quantum error correction", max_results=3)
+
+    assert len(calls) == 3
+
+
+def test_ttl_expiry(stub_tool, calls, clock):
+    cache = SemanticToolCache(stub_tool, ttl=60)
+
+    cache("quantum error correction")
+    clock[0] += 60
+    cache("quantum error correction")
+    assert len(calls) == 1
+
+    clock[0] += 1
+    cache("quantum error correction")
+    assert len(calls) == 2
+
+
+def test_invalid_hit_refetched(stub_tool, calls):
+    rejected = set()
+    cache = SemanticToolCache(stub_tool, is_valid=lambda response: response not in rejected)
+
+    first = cache("quantum error correction")
+    rejected.add(first)
+    second = cache("quantum error correction")
+
+    assert second != first
+    assert len(calls) == 2
+    # The refetched response replaces the rejected one
+    assert cache("quantum error correction") == second
+    assert len(calls) == 2
+
+
+def test_empty_results_not_cached(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool)
+
+    cache("nothing")
+    cache("nothing")
+
+    assert len(calls) == 2
+
+
+def test_maxsize_evicts_least_recently_used(stub_tool, calls):
+    cache = SemanticToolCache(stub_tool, maxsize=2)
+
+    cache("alpha")
+    cache("beta")
+    cache("alpha")
+    cache("gamma")
+    cache("alpha")
+    assert len(calls) == 3
+
+    cache("beta")
+    assert len(calls) == 4
+
+
+def test_as_tool_keeps_name_and_schema(stub_tool, calls):
+    tool = SemanticToolCache(stub_tool).as_tool()
+
+    assert tool.name == "stub_search"
+    assert tool.args == stub_tool.args
+    assert tool.invoke({"query": "quantum error correction"}) == tool.invoke(
+        {"query": "quantum error correction"}
+    )
+    assert len(calls) == 1